@@ -4,11 +4,10 @@
 import os
 from typing import List
 import click
-from tomlkit import load as load_toml
 import jammies.workspace.project as wspc
 from jammies.defn.registrar import setup as setup_registrar
 from jammies.defn.metadata import ProjectMetadata
-from jammies.config import JammiesConfig, load_config, config_loc as cloc
+from jammies.config import JammiesConfig, load_config, load_config_file, config_loc as cloc
 from jammies.log import Logger
 
 # TODO: REDO
@@ -211,11 +210,7 @@ def config_value(name: str, value: str | None = None, scope: str = 'project') ->
         return
 
     # Load config scope
-    prj_config: JammiesConfig = None
-    with open(config_path, mode = 'r', encoding = 'UTF-8') as file:
-        prj_config = load_toml(file)
-        prj_config['dirpath'] = os.curdir
-        prj_config = JammiesConfig.decode_toml(prj_config)
+    prj_config: JammiesConfig = load_config_file(config_path)
 
     # If a value is present, set it within the config
     if value:
@@ -3,16 +3,21 @@
 
 import sys
 import os
+from functools import lru_cache
 from glob import iglob
+from stat import S_ISREG
 from types import ModuleType
-from typing import Callable, Any, Tuple, List, Set
+from typing import Callable, Any, Dict, Tuple, List, Set, Iterator, TYPE_CHECKING
 from platformdirs import site_config_dir, user_config_dir
-from tomlkit import table, document, comment, TOMLDocument, load, dump, boolean, array
-from tomlkit.items import Table, Array
 from jammies.log import Logger
 from jammies.registrar import JammiesRegistrar
 from jammies.struct.codec import DictObject
-from jammies.module import dynamic_import, load_module
+from jammies.module import dynamic_import, load_module, has_module
+
+if TYPE_CHECKING:
+    # tomlkit is only imported when writing a configuration
+    from tomlkit import TOMLDocument
+    from tomlkit.items import Table, Array
 
 _ENV_VAR: str = 'JAMMIES_CONFIG_DIR'
 """The environment variable pointing to the config directory."""
@@ -26,6 +31,14 @@ _SCRIPT_DIR: str = 'scripts'
 _CONFIG_FILE: str = 'jammies.toml'
 """The name of the config file."""
 
+_PROJECT_CONFIG_FILE: str = f'.{_CONFIG_FILE}'
+"""The name of the config file within a project."""
+
+_TOML_LOADS: Callable[[str], DictObject] = load_module('tomllib').loads \
+    if has_module('tomllib') else load_module('tomlkit').loads
+"""The method used to parse TOML, using `tomllib` when available as
+formatting is only needed when writing."""
+
 def _project_config(dirpath: str, path : str) -> str:
     """Returns the path relative to the project configuration.
     
@@ -41,7 +54,7 @@ def _project_config(dirpath: str, path : str) -> str:
     str
         The path relative to the project configuration.
     """
-    return os.sep.join([dirpath, path])
+    return os.path.join(dirpath, path)
 
 def _env_var_config(path : str) -> str | None:
     """Returns the path relative to the environment variable configuration.
@@ -57,7 +70,7 @@ def _env_var_config(path : str) -> str | None:
         The path relative to the environment variable configuration.
     """
     if env_dir := os.getenv(_ENV_VAR):
-        return os.sep.join([env_dir, path])
+        return os.path.join(env_dir, path)
     return None
 
 def _site_config(path : str) -> str | None:
@@ -73,8 +86,10 @@ def _site_config(path : str) -> str | None:
     str
         The path relative to the site configuration.
     """
-    return os.sep.join([sys.prefix, _CONFIG_DIR, path]) if sys.prefix != sys.base_prefix else None
+    return os.path.join(sys.prefix, _CONFIG_DIR, path) \
+        if sys.prefix != sys.base_prefix else None
 
+@lru_cache(maxsize = None)
 def _user_config(path : str) -> str:
     """Returns the path relative to the user configuration.
     
@@ -88,8 +103,9 @@ def _user_config(path : str) -> str:
     str
         The path relative to the user configuration.
     """
-    return user_config_dir(os.sep.join([_CONFIG_DIR, path]), appauthor = False, roaming = True)
+    return user_config_dir(os.path.join(_CONFIG_DIR, path), appauthor = False, roaming = True)
 
+@lru_cache(maxsize = None)
 def _global_config(path : str) -> str:
     """Returns the path relative to the global configuration.
     
@@ -103,11 +119,48 @@ def _global_config(path : str) -> str:
     str
         The path relative to the global configuration.
     """
-    return site_config_dir(os.sep.join([_CONFIG_DIR, path]), appauthor = False, multipath = True)
+    return site_config_dir(os.path.join(_CONFIG_DIR, path), appauthor = False,
+        multipath = True)
+
+_SCOPE_RESOLVERS: Tuple[Callable[[str], str | None], ...] = (
+    _env_var_config,
+    _site_config,
+    _user_config,
+    _global_config
+)
+"""The methods returning the path relative to the environment variable, site, user,
+and global configuration, in order of precedence."""
+
+def _scope_paths(dirpath: str, path: str) -> Iterator[str]:
+    """Iterates through the path relative to each available configuration, starting
+    from the project.
+
+    Parameters
+    ----------
+    dirpath : str
+        The root directory of the project.
+    path : str
+        The relativized path.
+
+    Returns
+    -------
+    Iterator[str]
+        The path relative to each available configuration, in order of precedence.
+    """
+    yield _project_config(dirpath, path)
+    for resolver in _SCOPE_RESOLVERS:
+        if abs_path := resolver(path):
+            yield abs_path
+
+_MODULE_PATHS: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+"""A cache of project directories and relative module paths to the locations
+the module may be found in, in order of precedence."""
 
 class JammiesProjectConfig:
     """Configurations within the 'project' table."""
 
+    __slots__ = ('display_warning_message',)
+
     def __init__(self, display_warning_message: bool = True) -> None:
         """
         Parameters
@@ -129,7 +182,7 @@ class JammiesProjectConfig:
             'display_warning_message'
         ]
 
-    def encode_toml(self) -> Table:
+    def encode_toml(self) -> 'Table':
         """Encodes the 'project' config into a table.
 
         Returns
@@ -137,6 +190,8 @@ class JammiesProjectConfig:
         Table
             The encoded 'project' config.
         """
+        from tomlkit import table, boolean
+
         project: Table = table()
         project.comment('Project related settings')
         project.add('display_warning_message',
@@ -165,6 +220,8 @@ class JammiesProjectConfig:
 class JammiesInternalConfig:
     """Configurations within the 'internal' table."""
 
+    __slots__ = ('generated',)
+
     def __init__(self, generated: List[str] | None = None) -> None:
         """
         Parameters
@@ -188,7 +245,7 @@ class JammiesInternalConfig:
         """
         self.generated.add(path)
 
-    def encode_toml(self) -> Table:
+    def encode_toml(self) -> 'Table':
         """Encodes the 'internal' config into a table.
 
         Returns
@@ -196,6 +253,8 @@ class JammiesInternalConfig:
         Table
             The encoded 'internal' config.
         """
+        from tomlkit import table, array
+
         internal: Table = table()
         internal.comment('Internal data for current project (DO NOT MODIFY)')
 
@@ -226,19 +285,27 @@ class JammiesInternalConfig:
 class JammiesConfig:
     """Configurations for jammies."""
 
-    def __init__(self, project: JammiesProjectConfig = JammiesProjectConfig(),
-            internal: JammiesInternalConfig = JammiesInternalConfig(),
+    __slots__ = ('project', 'internal', 'dirpath')
+
+    def __init__(self, project: JammiesProjectConfig | None = None,
+            internal: JammiesInternalConfig | None = None,
             dirpath: str = os.curdir) -> None:
         """
         Parameters
         ----------
-        project : JammiesProjectConfig (default 'JammiesProjectConfig()')
-            The 'project' table within the configuration.
+        project : JammiesProjectConfig | None (default `None`)
+            The 'project' table within the configuration. When `None`, uses the default
+            settings.
+        internal : JammiesInternalConfig | None (default `None`)
+            The 'internal' table within the configuration. When `None`, uses the default
+            settings.
         dirpath : str (default '.')
             The root directory of the project.
         """
-        self.project: JammiesProjectConfig = project
-        self.internal: JammiesInternalConfig = internal
+        self.project: JammiesProjectConfig = \
+            project if project is not None else JammiesProjectConfig()
+        self.internal: JammiesInternalConfig = \
+            internal if internal is not None else JammiesInternalConfig()
         self.dirpath: str = dirpath
 
     def list_vals(self) -> Tuple[bool, str]:
@@ -318,7 +385,7 @@ class JammiesConfig:
 
         return (True, f'{str(prev)} -> {str(new_value)}')
 
-    def encode_toml(self, write_internal: bool = False) -> TOMLDocument:
+    def encode_toml(self, write_internal: bool = False) -> 'TOMLDocument':
         """Encodes the configuration.
 
         Returns
@@ -326,6 +393,8 @@ class JammiesConfig:
         TOMLDocument
             The encoded configuration.
         """
+        from tomlkit import document, comment
+
         doc: TOMLDocument = document()
         doc.add(comment('The configuration file for jammies'))
         doc.add('project', self.project.encode_toml())
@@ -369,9 +438,14 @@ class JammiesConfig:
         os.makedirs(os.path.dirname(output_path), exist_ok = True)
 
         # Write config to file
+        from tomlkit import dump
+
         with open(output_path, mode = 'w', encoding = 'UTF-8') as file:
             dump(self.encode_toml(write_internal = scope == 0), file)
 
+        # Invalidate any previously read configurations
+        _read_config.cache_clear()
+
     def update_and_write(self, setter: Callable[['JammiesConfig'], Any],
             save: bool = False) -> None:
         """Updates and writes the value to the project configuration.
@@ -421,7 +495,7 @@ class JammiesConfig:
 
             scripts: int = 0
 
-            for script in iglob(os.sep.join([script_dir, '**.py'])):
+            for script in iglob(os.path.join(script_dir, '**.py')):
                 module: ModuleType = dynamic_import(
                     _SCRIPT_DIR,
                     os.path.basename(script).rsplit(os.extsep, maxsplit = 1)[0],
@@ -437,21 +511,10 @@ class JammiesConfig:
         loaded_scripts: int = 0
 
         # Check config locations for 'scripts' directory
-        if (script_dir := _project_config(self.dirpath, _SCRIPT_DIR)) and os.path.isdir(script_dir):
-            logger.debug(f'Script directory detected: {script_dir}')
-            loaded_scripts += import_scripts(script_dir)
-        if (script_dir := _env_var_config(_SCRIPT_DIR)) and os.path.isdir(script_dir):
-            logger.debug(f'Script directory detected: {script_dir}')
-            loaded_scripts += import_scripts(script_dir)
-        if (script_dir := _site_config(_SCRIPT_DIR)) and os.path.isdir(script_dir):
-            logger.debug(f'Script directory detected: {script_dir}')
-            loaded_scripts += import_scripts(script_dir)
-        if (script_dir := _user_config(_SCRIPT_DIR)) and os.path.isdir(script_dir):
-            logger.debug(f'Script directory detected: {script_dir}')
-            loaded_scripts += import_scripts(script_dir)
-        if (script_dir := _global_config(_SCRIPT_DIR)) and os.path.isdir(script_dir):
-            logger.debug(f'Script directory detected: {script_dir}')
-            loaded_scripts += import_scripts(script_dir)
+        for script_dir in _scope_paths(self.dirpath, _SCRIPT_DIR):
+            if os.path.isdir(script_dir):
+                logger.debug(f'Script directory detected: {script_dir}')
+                loaded_scripts += import_scripts(script_dir)
 
         return loaded_scripts
 
@@ -477,23 +540,19 @@ class JammiesConfig:
         """
         # Separate module from method and get relative path
         module, method = tuple(module_method.split(':'))
-        rel_path: str = f'{os.sep.join([module_type] + module.split("."))}.py'
+        rel_path: str = os.extsep.join([os.path.join(module_type, *module.split('.')), 'py'])
         module_path: str | None = None
 
         # Find module path
         if module == 'internal':
             return getattr(load_module(f'jammies.{module}.{module_type}'), method)
 
-        if (abs_path := _project_config(self.dirpath, rel_path)) and os.path.exists(abs_path):
-            module_path = abs_path
-        elif (abs_path := _env_var_config(rel_path)) and os.path.exists(abs_path):
-            module_path = abs_path
-        elif (abs_path := _site_config(rel_path)) and os.path.exists(abs_path):
-            module_path = abs_path
-        elif (abs_path := _user_config(rel_path)) and os.path.exists(abs_path):
-            module_path = abs_path
-        elif (abs_path := _global_config(rel_path)) and os.path.exists(abs_path):
-            module_path = abs_path
+        # Reuse the locations resolved for the module, checking each as files may have changed
+        if (scope_paths := _MODULE_PATHS.get((self.dirpath, rel_path))) is None:
+            scope_paths = _MODULE_PATHS[(self.dirpath, rel_path)] = \
+                tuple(_scope_paths(self.dirpath, rel_path))
+        module_path = next((abs_path for abs_path in scope_paths
+            if os.path.isfile(abs_path)), None)
 
         # Load module if present
         if module_path:
@@ -506,7 +565,7 @@ class JammiesConfig:
 
 def _update_dict(original: DictObject, merging: DictObject) -> DictObject:
     """Merges the second dictionary into the first without replacing any
-    keys.
+    keys. Dictionaries present in both are merged in the same manner.
 
     Parameters
     ----------
@@ -520,21 +579,21 @@ def _update_dict(original: DictObject, merging: DictObject) -> DictObject:
     dict[str, any]
         The merged dictionary.
     """
-    for key, value in merging.items():
-        # Check if key isn't already present
-        if key not in original:
-             # Check if value is a dictionary
-            if isinstance(value, dict):
-                # If so, add key and update dict
-                original[key] = {}
-                _update_dict(original[key], merging[key])
-            else:
-                # Otherwise, merge key
-                original[key] = value
+    stack: List[Tuple[DictObject, DictObject]] = [(original, merging)]
+    while stack:
+        current, other = stack.pop()
+        for key, value in other.items():
+            # Check if key isn't already present
+            if key not in current:
+                # If so, merge key
+                current[key] = value
+            # Otherwise, merge dictionaries present in both
+            elif isinstance(value, dict) and isinstance(current[key], dict):
+                stack.append((current[key], value))
     return original
 
-def _read_and_update_dict(original: DictObject, path: str | None) -> DictObject:
-    """Loads a dictionary, if present, and merges it into the existing
+def _read_and_update_dict(original: DictObject, path: str) -> DictObject:
+    """Loads an existing dictionary and merges it into the existing
     dictionary.
     
     Parameters
@@ -549,10 +608,80 @@ def _read_and_update_dict(original: DictObject, path: str | None) -> DictObject:
     dict[str, any]
         The merged dictionary.
     """
-    if path and os.path.exists(path):
-        with open(path, mode = 'r', encoding = 'UTF-8') as file:
-            original = _update_dict(original, load(file))
-    return original
+    # Read the entire file at once before parsing
+    with open(path, mode = 'rb') as file:
+        return _update_dict(original, _TOML_LOADS(file.read().decode('UTF-8')))
+
+def _config_paths(dirpath: str) -> Tuple[str | None, ...]:
+    """Returns the locations of the configuration files in order of precedence.
+
+    Parameters
+    ----------
+    dirpath : str
+        The root directory of the current project.
+
+    Returns
+    -------
+    tuple[str | None, ...]
+        The project, environment variable, site, user, and global configuration
+        locations, or `None` if not applicable.
+    """
+    return (
+        _project_config(dirpath, _PROJECT_CONFIG_FILE),
+        _env_var_config(_CONFIG_FILE),
+        _site_config(_CONFIG_FILE),
+        _user_config(_CONFIG_FILE),
+        _global_config(_CONFIG_FILE)
+    )
+
+def _file_signature(path: str | None) -> Tuple[int, int] | None:
+    """Returns the modification time and size of a file.
+
+    Parameters
+    ----------
+    path : str | None
+        The path of the file.
+
+    Returns
+    -------
+    tuple[int, int] | None
+        The modification time in nanoseconds and size of the file, or `None`
+        if the file does not exist.
+    """
+    if not path:
+        return None
+
+    try:
+        stat: os.stat_result = os.stat(path)
+    except OSError:
+        return None
+
+    return (stat.st_mtime_ns, stat.st_size) if S_ISREG(stat.st_mode) else None
+
+@lru_cache(maxsize = 32)
+def _read_config(paths: Tuple[str | None, ...],
+        signatures: Tuple[Tuple[int, int] | None, ...]) -> DictObject:
+    """Reads and merges the configuration files, caching the result until
+    any of the files are modified.
+
+    Parameters
+    ----------
+    paths : tuple[str | None, ...]
+        The locations of the configuration files in order of precedence.
+    signatures : tuple[tuple[int, int] | None, ...]
+        The signatures of the configuration files, used to invalidate the cache.
+
+    Returns
+    -------
+    dict[str, any]
+        The merged configuration.
+    """
+    config: DictObject = {}
+    for path, signature in zip(paths, signatures):
+        # Only read files which exist, as they have already been checked
+        if signature is not None:
+            config = _read_and_update_dict(config, path)
+    return config
 
 def load_config(dirpath: str = os.curdir) -> JammiesConfig:
     """Loads the configuration for the project. Any settings that are not
@@ -569,20 +698,31 @@ def load_config(dirpath: str = os.curdir) -> JammiesConfig:
     JammiesConfig
         The loaded configuration.
     """
-    # Get project config
-    config: DictObject = _read_and_update_dict({}, _project_config(dirpath, f'.{_CONFIG_FILE}'))
+    # Read the project, environment variable, site, user, then global config
+    paths: Tuple[str | None, ...] = _config_paths(dirpath)
+    config: DictObject = dict(_read_config(paths, tuple(map(_file_signature, paths))))
 
-    # Get environment variable config
-    config = _read_and_update_dict(config, _env_var_config(_CONFIG_FILE))
+    # Set current project directory
+    config['dirpath'] = dirpath
+    return JammiesConfig.decode_toml(config)
 
-    # Get site config if available
-    config = _read_and_update_dict(config, _site_config(_CONFIG_FILE))
+def load_config_file(path: str, dirpath: str = os.curdir) -> JammiesConfig:
+    """Loads the configuration from a single file without merging any
+    other scopes.
 
-    # Read user config
-    config = _read_and_update_dict(config, _user_config(_CONFIG_FILE))
+    Parameters
+    ----------
+    path : str
+        The path of the configuration file.
+    dirpath : str (default '.')
+        The root directory of the current project.
 
-    # Read global config
-    config = _read_and_update_dict(config, _global_config(_CONFIG_FILE))
+    Returns
+    -------
+    JammiesConfig
+        The loaded configuration.
+    """
+    config: DictObject = _read_and_update_dict({}, path)
 
     # Set current project directory
     config['dirpath'] = dirpath
@@ -608,7 +748,7 @@ def config_loc(dirpath: str = os.curdir, scope: int = 0) -> str:
     match scope:
         case 0:
             # Project config
-            output_path: str = _project_config(dirpath, f'.{_CONFIG_FILE}')
+            output_path: str = _project_config(dirpath, _PROJECT_CONFIG_FILE)
         case 1:
             # Env var config if present
             if env_var := _env_var_config(_CONFIG_FILE):
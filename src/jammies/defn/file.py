@@ -3,10 +3,10 @@ from the metadata.
 """
 
 import os
-from typing import TypeVar, List, Callable, Tuple, TypeAlias
+import sys
+from typing import TypeVar, Dict, Callable, Tuple, TypeAlias
 from abc import ABC, abstractmethod
 from jammies.log import Logger
-from jammies.utils import get_default, get_or_default
 from jammies.struct.codec import DictObject, DictCodec
 
 PostProcessor: TypeAlias = Callable[[Logger, str], bool]
@@ -14,13 +14,18 @@ PostProcessor: TypeAlias = Callable[[Logger, str], bool]
 a boolean represent whether the execution was successful.
 """
 
+_DEFAULT_DIR: str = os.curdir
+"""The default directory of a project file relative to the project root."""
+
 class ProjectFile(ABC):
     """An abstract class containing information about a file associated with the project.
     """
 
+    __slots__ = ('_codec', 'name', 'dir', 'post_processor', 'extra')
+
     @abstractmethod
     def __init__(self, codec: 'ProjectFileCodec',
-            name: str = "", rel_dir: str = os.curdir,
+            name: str = "", rel_dir: str = _DEFAULT_DIR,
             post_processor: Tuple[PostProcessor, DictObject] | None = None,
             extra: DictObject | None = None) -> None:
         """
@@ -94,13 +99,22 @@ class ProjectFile(ABC):
         str
             The newly created path.
         """
-        fpath: List[str] = [root_dir, self.dir]
-        fpath += paths
-        return os.sep.join(fpath)
+        return os.path.join(root_dir, self.dir, *paths)
 
 PF = TypeVar('PF', bound = ProjectFile)
 """The type of the project file."""
 
+_COMMON_PARAMS: Dict[str, str] = {
+    'name': 'name',
+    'dir': 'rel_dir',
+    'post_processor': 'post_processor',
+    'extra': 'extra'
+}
+"""A map of keys common to all encoded project files to their `ProjectFile` parameter."""
+
+_INTERNED_PARAMS: Tuple[str, ...] = ('name', 'rel_dir')
+"""The string parameters of a `ProjectFile` which commonly repeat across files."""
+
 class ProjectFileCodec(DictCodec[PF]):
     """An abstract, generic encoder and decoder between a dictionary and a ProjectFile.
 
@@ -121,14 +135,16 @@ class ProjectFileCodec(DictCodec[PF]):
         self.registrar = registrar
 
     def decode(self, obj: DictObject) -> PF:
-        return self.decode_type(obj,
-            name = get_or_default(obj, 'name', ProjectFile),
-            rel_dir = get_or_default(obj, 'dir', ProjectFile, param = 'rel_dir'),
-            post_processor = self.__decode_post_processor(
-                get_or_default(obj, 'post_processor', ProjectFile)
-            ),
-            extra = get_or_default(obj, 'extra', ProjectFile)
-        )
+        # Only pass present parameters, leaving the rest to the constructor defaults
+        kwargs: DictObject = {param: obj[key] for key, param in _COMMON_PARAMS.items()
+            if key in obj}
+        # Share storage for names and directories repeated across files
+        for param in _INTERNED_PARAMS:
+            if isinstance(value := kwargs.get(param), str):
+                kwargs[param] = sys.intern(value)
+        if 'post_processor' in kwargs:
+            kwargs['post_processor'] = self.__decode_post_processor(kwargs['post_processor'])
+        return self.decode_type(obj, **kwargs)
 
     def __decode_post_processor(self,
             post_processor: DictObject | None) -> Tuple[PostProcessor, DictObject]:
@@ -167,7 +183,7 @@ class ProjectFileCodec(DictCodec[PF]):
         dict_obj['type'] = obj.registry_name()
         if obj.name:
             dict_obj['name'] = obj.name
-        if obj.dir != get_default(ProjectFile, 'rel_dir'):
+        if obj.dir != _DEFAULT_DIR:
             dict_obj['dir'] = obj.dir
         if obj.post_processor:
             dict_obj['post_processor'] = obj.post_processor[1]
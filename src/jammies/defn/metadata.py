@@ -2,25 +2,32 @@
 """
 
 import os
-from typing import List, Tuple, Set, Dict
-from pathlib import Path, PurePath
+import re
+from functools import lru_cache
+from typing import List, Tuple, Set, FrozenSet, Dict, Callable, Mapping
+from types import MappingProxyType
+from pathlib import PurePath
 import shutil
 import fnmatch
+from concurrent.futures import ThreadPoolExecutor
 from jammies.log import Logger
 from jammies.registrar import JammiesRegistrar
-from jammies.defn.file import ProjectFile
+from jammies.defn.file import ProjectFile, ProjectFileCodec
 from jammies.struct.codec import DictCodec, DictObject
-from jammies.utils import get_or_default, input_yn_default
+from jammies.utils import input_yn_default, iter_files, SKIPPED_DIRS
 from jammies.config import JammiesConfig
 
-_DEFAULT_LOCATIONS: Dict[str, str] = {
+_DEFAULT_LOCATIONS: Mapping[str, str] = MappingProxyType({
     'clean': 'clean',
     'src': 'src',
     'patches': 'patches',
     'out': 'out'
-}
+})
 """The default locations used by the project metadata."""
 
+_OPTIONAL_KEYS: Tuple[str, ...] = ('ignore', 'overwrite', 'location', 'extra')
+"""The optional keys of an encoded project metadata, named the same as their parameter."""
+
 class ProjectMetadata:
     """Metadata information associated with the project being patched or ran."""
 
@@ -44,11 +51,9 @@ class ProjectMetadata:
         self.files: List[ProjectFile] = files
         self.ignore: List[str] = [] if ignore is None else ignore
         self.overwrite: List[str] = [] if overwrite is None else overwrite
-        self.location: Dict[str, str] = {} if location is None else location
-        # Add Missing Defaults
-        for key, value in _DEFAULT_LOCATIONS.items():
-            if key not in self.location:
-                self.location[key] = value
+        # Add missing defaults
+        self.location: Dict[str, str] = {**_DEFAULT_LOCATIONS} if location is None \
+            else {**_DEFAULT_LOCATIONS, **location}
         self.extra: DictObject = {} if extra is None else extra
 
     def __copy_and_log(self, root: str, src: str, dst: str, config: JammiesConfig) -> object:
@@ -70,6 +75,40 @@ class ProjectMetadata:
         config.internal.add_generated_file(PurePath(dst[(len(root) + 1):]).as_posix())
         return output
 
+    def __setup_file(self, file: ProjectFile, tmp_dir: str, logger: Logger) -> bool:
+        """Sets up and post processes a single project file within a temporary directory.
+
+        Parameters
+        ----------
+        file : `ProjectFile`
+            The project file to set up.
+        tmp_dir : str
+            The temporary directory to set up the project file in.
+        logger : `Logger`
+            A logger for reporting on information.
+
+        Returns
+        -------
+        bool
+            `True` if the project file was set up and post processed successfully.
+        """
+
+        # Setup file
+        if not file.setup(tmp_dir, ignore_sub_directory = True):
+            logger.error(
+                f'Failed to setup {file.name if file.name else file.registry_name()}')
+            return False
+
+        # Apply post processor
+        if file.post_processor and \
+                not file.post_processor[0](logger, tmp_dir, **file.post_processor[1]):
+            pp_name: str = file.post_processor[1]['type']
+            logger.error(f'Failed to apply post processor \'{pp_name}\' ' \
+                            + f'to {file.name if file.name else file.registry_name()}')
+            return False
+
+        return True
+
     def setup(self, root_dir: str, logger: Logger, config: JammiesConfig | None = None) -> bool:
         """Sets up the project for usage.
 
@@ -113,40 +152,37 @@ class ProjectMetadata:
         if config:
             config.internal.clear_generated_files()
 
-        failed: List[ProjectFile] = []
         tmp_root: str = os.path.join(root_dir, '.tmp')
-
-        for file in self.files: # type: ProjectFile
-            # Setup file
-            if not file.setup(tmp_root, ignore_sub_directory = True):
-                logger.error(f'Failed to setup {file.name if file.name else file.registry_name()}')
-                failed.append(file)
-                shutil.rmtree(tmp_root)
+        tmp_dirs: List[str] = [os.path.join(tmp_root, str(idx))
+            for idx in range(len(self.files))]
+
+        # Download and post process each file within its own temporary directory
+        with ThreadPoolExecutor(max_workers = max(min(len(self.files), 8), 1)) as executor:
+            results: List[bool] = list(executor.map(
+                lambda file, tmp_dir: self.__setup_file(file, tmp_dir, logger),
+                self.files, tmp_dirs
+            ))
+
+        # Copy the files into the root directory in order
+        for file, tmp_dir, success in zip(self.files, tmp_dirs, results):
+            if not success:
                 continue
 
-            # Apply post processor
-            if file.post_processor and \
-                    not file.post_processor[0](logger, tmp_root, **file.post_processor[1]):
-                pp_name: str = file.post_processor[1]['type']
-                logger.error(f'Failed to apply post processor \'{pp_name}\' ' \
-                                + f'to {file.name if file.name else file.registry_name()}')
-                failed.append(file)
-                shutil.rmtree(tmp_root)
-                continue
-
-            shutil.copytree(tmp_root, file.create_path(root_dir),
-                copy_function=lambda src, dst: self.__copy_and_log(root_dir, src, dst, config) \
+            shutil.copytree(tmp_dir, file.create_path(root_dir),
+                copy_function=(lambda src, dst:
+                    self.__copy_and_log(root_dir, src, dst, config))
                     if config else shutil.copy2,
                 dirs_exist_ok=True
             )
-            shutil.rmtree(tmp_root)
+
+        shutil.rmtree(tmp_root, ignore_errors = True)
 
         # Write generated files
         if config:
             config.update_and_write(lambda _: None, save = True)
 
         # Verify no files failed at any point
-        return not failed
+        return all(results)
 
     def codec(self) -> 'ProjectMetadataCodec':
         """Returns the codec used to encode and decode this metadata.
@@ -169,24 +205,103 @@ class ProjectMetadata:
         Returns
         -------
         (set of strs, set of strs)
-            A tuple of ignored and overwritten files, respectively.
+            A tuple of ignored and overwritten files, respectively. A file
+            matching both is only ignored.
         """
 
-        # Get all files
-        files: list[str] = [Path(os.path.relpath(path, root_dir)).as_posix() \
-            for path in Path(root_dir).rglob('*') if path.is_file()]
+        ignored: Set[str] = set()
+        overwritten: Set[str] = set()
+        ignore_literals, ignore_globs = _split_patterns(tuple(self.ignore))
+        overwrite_literals, overwrite_globs = _split_patterns(tuple(self.overwrite))
+        regex: re.Pattern | None = _compile_patterns(ignore_globs, overwrite_globs)
+        if regex is None and not ignore_literals and not overwrite_literals:
+            return (ignored, overwritten)
+
+        # Classify files as posix paths while walking, only keeping matches
+        match: Callable[[str], re.Match | None] | None = \
+            None if regex is None else regex.match
+        for _, rel_path in iter_files(root_dir, skip_dirs = SKIPPED_DIRS):
+            file: str = rel_path.replace(os.sep, '/')
+            norm_file: str = os.path.normcase(file)
+            if norm_file in ignore_literals:
+                ignored.add(file)
+            elif match is not None and (result := match(norm_file)) is not None:
+                (ignored if result.lastgroup == 'ignore' else overwritten).add(file)
+            elif norm_file in overwrite_literals:
+                overwritten.add(file)
+
+        return (ignored, overwritten)
+
+_GLOB_CHARS: FrozenSet[str] = frozenset('*?[')
+"""The characters which make a pattern match more than a single path."""
+
+@lru_cache(maxsize = 64)
+def _split_patterns(patterns: Tuple[str, ...]) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+    """Splits the glob patterns into literal paths, which can be looked up
+    directly, and the patterns which need to be matched.
+
+    Parameters
+    ----------
+    patterns : tuple of strs
+        The glob patterns to split.
 
-        # Get ignored files
-        ignored_files: Set[str] = set()
-        for ignore in self.ignore: # type: str
-            ignored_files.update(fnmatch.filter(files, ignore))
+    Returns
+    -------
+    (frozenset of strs, tuple of strs)
+        A tuple of the case-normalized literal paths and the remaining patterns, respectively.
+    """
+    literals: Set[str] = set()
+    globs: List[str] = []
+    for pattern in patterns:
+        if _GLOB_CHARS.isdisjoint(pattern):
+            literals.add(os.path.normcase(pattern))
+        else:
+            globs.append(pattern)
+    return (frozenset(literals), tuple(globs))
+
+@lru_cache(maxsize = 32)
+def _compile_patterns(ignore: Tuple[str, ...],
+        overwrite: Tuple[str, ...]) -> re.Pattern | None:
+    """Compiles the ignore and overwrite glob patterns into a single regex. The
+    matched group is named after the patterns it came from, with ignore patterns
+    taking precedence.
+
+    Parameters
+    ----------
+    ignore : tuple of strs
+        The glob patterns for ignored files.
+    overwrite : tuple of strs
+        The glob patterns for overwritten files.
+
+    Returns
+    -------
+    re.Pattern | None
+        The regex matching any of the patterns, or `None` if there are no patterns.
+    """
+    if not ignore and not overwrite:
+        return None
 
-        # Get overwritten files
-        overwritten_files: Set[str] = set()
-        for overwrite in self.overwrite: # type: str
-            overwritten_files.update(fnmatch.filter(files, overwrite))
+    return re.compile(f'(?P<ignore>{_join_patterns(ignore)})'
+        f'|(?P<overwrite>{_join_patterns(overwrite)})')
 
-        return (ignored_files, overwritten_files)
+def _join_patterns(patterns: Tuple[str, ...]) -> str:
+    """Translates glob patterns into a regex alternation.
+
+    Parameters
+    ----------
+    patterns : tuple of strs
+        The glob patterns to translate.
+
+    Returns
+    -------
+    str
+        The regex matching any of the patterns, or never matching if there are no patterns.
+    """
+    if not patterns:
+        return '(?!)'
+
+    return '|'.join(f'(?:{fnmatch.translate(os.path.normcase(pattern))})'
+        for pattern in patterns)
 
 def build_metadata() -> ProjectMetadata:
     """Builds a ProjectMetadata from user input.
@@ -240,7 +355,7 @@ class ProjectMetadataCodec(DictCodec[ProjectMetadata]):
 
     def encode(self, obj: ProjectMetadata) -> DictObject:
         dict_obj: DictObject = {}
-        dict_obj['files'] = list(map(lambda file: file.codec().encode(file), obj.files))
+        dict_obj['files'] = [file.codec().encode(file) for file in obj.files]
         if obj.ignore:
             dict_obj['ignore'] = obj.ignore
         if obj.overwrite:
@@ -258,27 +373,12 @@ class ProjectMetadataCodec(DictCodec[ProjectMetadata]):
             dict_obj['extra'] = obj.extra
         return dict_obj
 
-    def __decode_file(self, file: DictObject) -> ProjectFile:
-        """Decodes a project file from its type.
-
-        Parameters
-        ----------
-        file : Dict[str, Any]
-            The encoded project file.
-        
-        Returns
-        -------
-        `ProjectFile`
-            The decoded project file.
-        """
-        return self.registrar.get_project_file_codec(file['type']).decode(file)
-
     def decode(self, obj: DictObject) -> ProjectMetadata:
-        return ProjectMetadata(list(map(self.__decode_file, obj['files'])),
-            ignore = get_or_default(obj, 'ignore', ProjectMetadata),
-            overwrite = get_or_default(obj, 'overwrite', ProjectMetadata),
-            location = get_or_default(obj, 'location', ProjectMetadata),
-            extra = get_or_default(obj, 'extra', ProjectMetadata))
+        get_codec: Callable[[str], ProjectFileCodec] = self.registrar.get_project_file_codec
+        # Only pass present parameters, leaving the rest to the constructor defaults
+        return ProjectMetadata(
+            [get_codec(file['type']).decode(file) for file in obj['files']],
+            **{key: obj[key] for key in _OPTIONAL_KEYS if key in obj})
 
 METADATA_CODEC: ProjectMetadataCodec = ProjectMetadataCodec()
 """The codec for :class:`jammies.metadata.base.ProjectMetadata`."""
@@ -2,9 +2,7 @@
 """
 
 import os
-from typing import Set
-from git import Repo
-from git.util import rmtree
+from typing import FrozenSet
 from jammies.utils import get_default, input_with_default, input_yn_default
 from jammies.struct.codec import DictObject
 from jammies.defn.file import ProjectFile, ProjectFileCodec
@@ -26,16 +24,18 @@ def setup_delegate(registrar: JammiesRegistrar) -> None:
 
     registrar.register_file_handler(_REGISTRY_NAME, codec, build_git)
 
-_VALID_BRANCH_TYPES: Set[str] = {
+_VALID_BRANCH_TYPES: FrozenSet[str] = frozenset({
     'branch',
     'commit',
     'tag'
-}
+})
 """A set of valid keys indicating the checkout location of the Git repository."""
 
 class GitProjectFile(ProjectFile):
     """A project file for an Git repository."""
 
+    __slots__ = ('repository', 'branch', 'branch_type')
+
     def __init__(self, repository: str, branch_type: str = 'branch',
             branch: str | None = None, **kwargs: DictObject) -> None:
         """
@@ -61,17 +61,54 @@ class GitProjectFile(ProjectFile):
         return _REGISTRY_NAME
 
     def setup(self, root_dir: str, ignore_sub_directory: bool = False) -> bool:
+        # Only load GitPython when a repository is cloned
+        from git import Repo, GitCommandError
+        from git.util import rmtree
+
         super().setup(root_dir, ignore_sub_directory = ignore_sub_directory)
         base_path: str = root_dir if ignore_sub_directory else self.create_path(root_dir)
 
-        # Checkout and change branches, if applicable
-        with Repo.clone_from(self.repository, base_path) as repo:
-            if self.branch is not None:
-                repo.git.checkout(self.branch)
+        try:
+            self.__shallow_clone(base_path)
+        except GitCommandError:
+            # Fall back to a full clone for locations that cannot be fetched directly
+            if os.path.exists(git_dir := os.path.join(base_path, '.git')):
+                rmtree(git_dir)
+
+            # Checkout and change branches, if applicable
+            with Repo.clone_from(self.repository, base_path) as repo:
+                if self.branch is not None:
+                    repo.git.checkout(self.branch)
 
         rmtree(os.path.join(base_path, '.git'))
         return True
 
+    def __shallow_clone(self, base_path: str) -> None:
+        """Clones only the latest snapshot of the checkout location, as the
+        history is removed after setup.
+
+        Parameters
+        ----------
+        base_path : str
+            The directory to clone the repository into.
+        """
+        from git import Repo
+
+        # Commits cannot be cloned directly, so fetch the single commit instead
+        if self.branch_type == 'commit' and self.branch is not None:
+            with Repo.init(base_path) as repo:
+                repo.create_remote('origin', self.repository)
+                repo.git.fetch('origin', self.branch, depth = 1, no_tags = True)
+                repo.git.checkout('FETCH_HEAD')
+        elif self.branch is not None:
+            with Repo.clone_from(self.repository, base_path, depth = 1,
+                    branch = self.branch, single_branch = True, no_tags = True):
+                pass
+        else:
+            with Repo.clone_from(self.repository, base_path, depth = 1,
+                    single_branch = True, no_tags = True):
+                pass
+
 def build_git(registrar: JammiesRegistrar) -> GitProjectFile:
     """Builds a GitProjectFile from user input.
     
@@ -109,12 +146,8 @@ class GitProjectFileCodec(ProjectFileCodec[GitProjectFile]):
 
     def decode_type(self, obj: DictObject, **kwargs: DictObject) -> GitProjectFile:
         kwargs['codec'] = self # Set codec
-        for branch_name in _VALID_BRANCH_TYPES: # type: str
-            if branch_name in obj:
-                return GitProjectFile(
-                    obj['repository'],
-                    branch = obj[branch_name],
-                    branch_type = branch_name,
-                    **kwargs
-                )
+        # Find the checkout location, if present
+        if branch_names := _VALID_BRANCH_TYPES & obj.keys():
+            branch_name: str = next(iter(branch_names))
+            kwargs['branch_type'], kwargs['branch'] = branch_name, obj[branch_name]
         return GitProjectFile(obj['repository'], **kwargs)
@@ -2,7 +2,7 @@
 """
 
 import os
-import subprocess as sp
+import shutil
 from jammies.module import load_module, has_module
 from jammies.registrar import JammiesRegistrar
 
@@ -18,8 +18,8 @@ def setup(registrar: JammiesRegistrar) -> None:
         The registrar used to register the components for the project.
     """
 
-    # Check if git is present on the machine
-    if sp.run(['git', '--help'], check = False, stdout = sp.DEVNULL).returncode == 0 \
+    # Check if git is present on the machine without spawning a process
+    if shutil.which(os.getenv('GIT_PYTHON_GIT_EXECUTABLE', 'git')) is not None \
             and has_module('git'):
         load_module('jammies.internal.file.delegate.gitrepo').setup_delegate(registrar)
     else:
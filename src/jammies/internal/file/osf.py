@@ -28,6 +28,8 @@ _REGISTRY_NAME: str = 'osf'
 class OSFProjectFile(ProjectFile):
     """A project file for an Open Science Framework repository."""
 
+    __slots__ = ('project_id',)
+
     def __init__(self, project_id: str, **kwargs: DictObject) -> None:
         """
         Parameters
@@ -37,8 +39,6 @@ class OSFProjectFile(ProjectFile):
         """
         super().__init__(**kwargs)
         self.project_id: str = project_id
-        self.__url: str = \
-            f'https://files.osf.io/v1/resources/{project_id}/providers/osfstorage/?zip='
 
     def registry_name(self) -> str:
         return _REGISTRY_NAME
@@ -46,7 +46,9 @@ class OSFProjectFile(ProjectFile):
     def setup(self, root_dir: str, ignore_sub_directory: bool = False) -> bool:
         super().setup(root_dir, ignore_sub_directory = ignore_sub_directory)
         base_path: str = root_dir if ignore_sub_directory else self.create_path(root_dir)
-        return download_and_write(self.__url, out_dir = base_path)
+        return download_and_write(
+            f'https://files.osf.io/v1/resources/{self.project_id}/providers/osfstorage/?zip=',
+            out_dir = base_path)
 
 def build_osf(registrar: JammiesRegistrar) -> OSFProjectFile:
     """Builds an OSFProjectFile from user input.
@@ -28,6 +28,8 @@ class URLProjectFile(ProjectFile):
     """A project file for a file at a downloadable url link.
     The file will be obtained via a GET request."""
 
+    __slots__ = ('url',)
+
     def __init__(self, url: str, **kwargs) -> None:
         """
         Parameters
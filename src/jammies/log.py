@@ -2,6 +2,10 @@
 """
 
 from typing import List
+from threading import Lock
+
+_PRINT_LOCK: Lock = Lock()
+"""A lock preventing messages logged from multiple threads from interleaving."""
 
 def _log(header: str, *args, **kwargs) -> None:
     """A general logger which applies a header
@@ -15,7 +19,8 @@ def _log(header: str, *args, **kwargs) -> None:
     """
     args: List = list(args)
     args[0] = f'{header}: {args[0]}'
-    print(*args, **kwargs)
+    with _PRINT_LOCK:
+        print(*args, **kwargs)
 
 class Logger:
     """A general logger for messages in the module."""
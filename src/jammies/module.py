@@ -1,12 +1,17 @@
 """A script which holds all lazy references to a given
 class."""
 
+import os
 import sys
 from types import ModuleType
-from typing import Callable
+from typing import Callable, Tuple
 from importlib.machinery import ModuleSpec
 from importlib.util import find_spec, LazyLoader, module_from_spec, spec_from_file_location
 
+_SOURCE_ATTR: str = '__jammies_source__'
+"""The attribute storing the location and modification time of a dynamically
+imported script."""
+
 def has_module(name: str) -> bool:
     """Checks whether the module is currently loaded or can be added to the current workspace.
 
@@ -106,6 +111,16 @@ def dynamic_import(module_type: str, name: str, path: str) -> ModuleType:
         The dynamically loaded module.
     """
     module_name: str = f'jammies.dynamic.{module_type}.{name}'
+    source: Tuple[str, int] = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+
+    # Reuse the loaded module unless its script was modified since it was loaded
+    if (module := sys.modules.get(module_name)) is not None:
+        loaded: Tuple[str, int] | None = getattr(module, _SOURCE_ATTR, None)
+        if loaded is None or loaded[0] != source[0] or loaded[1] == source[1]:
+            return module
+        del sys.modules[module_name]
 
-    return load_module(module_name,
+    module: ModuleType = load_module(module_name,
         spec_getter = lambda mdn: spec_from_file_location(mdn, location = path))
+    setattr(module, _SOURCE_ATTR, source)
+    return module
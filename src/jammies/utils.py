@@ -2,17 +2,32 @@
 """
 
 import os
+import sys
 import re
 import inspect
-from typing import Any, Dict, Callable, TypeVar, Tuple
-from io import IOBase, BytesIO
+import shutil
+import json
+from hashlib import sha256
+from functools import lru_cache
+from http import HTTPStatus
+from typing import Any, Dict, Callable, TypeVar, Tuple, Iterator, List, FrozenSet, \
+    AbstractSet, BinaryIO, TYPE_CHECKING
+from io import IOBase
+from tempfile import SpooledTemporaryFile, mkstemp
 from mimetypes import guess_extension
-from zipfile import ZipFile
-from urllib.parse import urlparse
-import requests
+from urllib.parse import urlparse, unquote
+from threading import Lock
+from platformdirs import user_cache_dir
+from jammies.module import load_module
 
+if TYPE_CHECKING:
+    # Networking is only imported when a file is downloaded
+    import requests
+
+@lru_cache(maxsize = None)
 def get_default(func: Callable[..., Any], param: str) -> Any | None:
     """Gets the default value of a function parameter, or `None` if not applicable.
+    The result is cached per function and parameter as signatures do not change.
     
     Parameters
     ----------
@@ -118,81 +133,558 @@ def unzip(file: str | IOBase, out_dir: str = os.curdir) -> None:
     out_dir : str (default '.')
         The directory to extract the zip file to.
     """
+    from zipfile import ZipFile
+
     with ZipFile(file, 'r') as zip_ref: # type: ZipFile
         zip_ref.extractall(out_dir)
 
-_FILENAME_PARAM_REGEX: str = \
-    r'filename=(?:([A-Za-z0-9\!\#\$\%\&\'\*\+\-\.\^\_\`\|\~]+)|(?:\"([^\"]*)\"))'
+SKIPPED_DIRS: FrozenSet[str] = frozenset(('.git', '.hg', '.svn', '__pycache__'))
+"""The names of version control and cache directories which never contain project files."""
+
+def iter_files(root_dir: str,
+        skip_dirs: AbstractSet[str] = frozenset()) -> Iterator[Tuple[str, str]]:
+    """Iterates through all files within a directory and its subdirectories.
+    Symbolic links to directories are not followed, matching `os.walk`.
+
+    Parameters
+    ----------
+    root_dir : str
+        The directory to iterate through.
+    skip_dirs : set of strs (default `frozenset()`)
+        The names of subdirectories which should not be iterated through.
+
+    Returns
+    -------
+    Iterator[Tuple[str, str]]
+        An iterator of the path of each file and its path relative to the root directory.
+    """
+    dirs: List[Tuple[str, str]] = [(root_dir, '')]
+    while dirs:
+        dir_path, rel_dir = dirs.pop()
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries: # type: os.DirEntry
+                    rel_path: str = os.path.join(rel_dir, entry.name) \
+                        if rel_dir else entry.name
+                    if not entry.is_dir():
+                        yield entry.path, rel_path
+                    elif not entry.is_symlink() and entry.name not in skip_dirs:
+                        dirs.append((entry.path, rel_path))
+        except OSError:
+            pass # Skip unreadable directories, matching `os.walk`
+
+_FICLONE: int = 0x40049409
+"""The ioctl request used to clone a file on Linux."""
+
+_COPY_RANGE_SIZE: int = 1 << 30
+"""The maximum number of bytes to copy within the kernel per call."""
+
+def clone_file(src: str, dst: str) -> str:
+    """Copies a file along with its metadata, sharing the underlying data
+    through a copy-on-write clone when the filesystem supports it, or
+    otherwise copying within the kernel.
+
+    Parameters
+    ----------
+    src : str
+        The path of the file to copy.
+    dst : str
+        The path to copy the file to.
+
+    Returns
+    -------
+    str
+        The path the file was copied to.
+    """
+    if sys.platform.startswith('linux'):
+        try:
+            with open(src, mode = 'rb') as src_file, open(dst, mode = 'wb') as dst_file:
+                src_fd, dst_fd = src_file.fileno(), dst_file.fileno() # type: int, int
+                try:
+                    load_module('fcntl').ioctl(dst_fd, _FICLONE, src_fd)
+                except OSError:
+                    # Clone not supported, copy without passing through user space
+                    while os.copy_file_range(src_fd, dst_fd, _COPY_RANGE_SIZE):
+                        pass
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            pass # Kernel copy not supported, fallback to a full copy
+
+    return shutil.copy2(src, dst)
+
+_FILENAME_PARAM_REGEX: re.Pattern = re.compile(
+    r'filename=(?:([A-Za-z0-9\!\#\$\%\&\'\*\+\-\.\^\_\`\|\~]+)|(?:\"([^\"]*)\"))')
 """Regex for getting the filename from the content-disposition header using the
 [RFC6266](https://datatracker.ietf.org/doc/html/rfc6266#section-4.1) spec.
 """
 
-_FILENAME_STAR_PARAM_REGEX: str = \
-    r'filename\*=(?:[A-Za-z0-9\!\#\$\%\&\+\-\^\_\`\{\}\~]+)\'[A-Za-z0-9\%\-]*\'' \
-        + r'((?:%[0-9A-Fa-f]{2}|[A-Za-z0-9\!\#\$\%\&\+\-\.\^\_\`\|\~])*)'
+_FILENAME_STAR_PARAM_REGEX: re.Pattern = re.compile(
+    r'filename\*=([A-Za-z0-9\!\#\$\%\&\+\-\^\_\`\{\}\~]+)\'[A-Za-z0-9\%\-]*\''
+        + r'((?:%[0-9A-Fa-f]{2}|[A-Za-z0-9\!\#\$\%\&\+\-\.\^\_\`\|\~])*)')
 """Regex for getting the filename* from the content-disposition header using the
 [RFC8187](https://datatracker.ietf.org/doc/html/rfc8187) spec.
 """
 
+_CHUNK_SIZE: int = 1 << 20
+"""The number of bytes to read from a response at a time."""
+
+_SPOOL_MAX_SIZE: int = 64 << 20
+"""The number of bytes a downloaded archive may hold in memory before being
+written to disk."""
+
 _CONTENT_DISPOSITION: str = 'content-disposition'
 """The header for the content disposition."""
 
 _CONTENT_TYPE: str = 'content-type'
 """The header for the content type."""
 
-def download_file(url: str, handler: Callable[[requests.Response, str], bool],
+_CONTENT_LENGTH: str = 'content-length'
+"""The header for the number of bytes in the content."""
+
+_ETAG: str = 'etag'
+"""The header for the entity tag of the response."""
+
+_LAST_MODIFIED: str = 'last-modified'
+"""The header for the last time the response was modified."""
+
+_CACHE_CONTROL: str = 'cache-control'
+"""The header for the caching directives of the response."""
+
+_CACHED_HEADERS: Tuple[str, ...] = (
+    _ETAG, _LAST_MODIFIED, _CONTENT_DISPOSITION, _CONTENT_TYPE
+)
+"""The headers of a response stored at the start of a cached download."""
+
+_HTTP_CACHE_MAX_ENTRY_SIZE: int = 32 << 20
+"""The number of bytes a download may contain to be cached."""
+
+_HTTP_CACHE_MAX_SIZE: int = 256 << 20
+"""The number of bytes the cached downloads may hold before the least recently
+used are removed."""
+
+_SESSION: 'requests.Session | None' = None
+"""The session used to download all files, created on first use."""
+
+_SESSION_LOCK: Lock = Lock()
+"""A lock preventing multiple sessions from being created concurrently."""
+
+def _get_session() -> 'requests.Session':
+    """Gets the session which reuses connections across downloads and retries
+    on transient failures, creating it if not yet present.
+
+    Returns
+    -------
+    requests.Session
+        The session used to download all files.
+    """
+    global _SESSION
+
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            from requests import Session
+            from requests.adapters import HTTPAdapter
+            from urllib3.util import Retry
+
+            session: Session = Session()
+            adapter: HTTPAdapter = HTTPAdapter(pool_connections = 16, pool_maxsize = 16,
+                max_retries = Retry(total = 3, backoff_factor = 0.3))
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _SESSION = session
+
+    return _SESSION
+
+def _copy_response(response: 'requests.Response', file: IOBase, stream: bool = True) -> None:
+    """Copies the content of the response into the file.
+
+    Parameters
+    ----------
+    response : requests.Response
+        The response of the url request.
+    file : io.IOBase
+        The binary file to write the content to.
+    stream : bool (default True)
+        If `False`, the response content has already been downloaded.
+    """
+    if stream:
+        # Decode any transfer encodings while copying the raw stream
+        if hasattr(response.raw, 'decode_content'):
+            response.raw.decode_content = True
+        shutil.copyfileobj(response.raw, file, length = _CHUNK_SIZE)
+    else:
+        file.write(response.content)
+
+@lru_cache(maxsize = None)
+def _http_cache_dir() -> str:
+    """Gets the directory containing the cached downloads, resolved on first use.
+
+    Returns
+    -------
+    str
+        The directory containing the cached downloads.
+    """
+    return user_cache_dir(os.path.join('jammies', 'http'), appauthor = False)
+
+def _http_cache_path(url: str) -> str:
+    """Gets the path of the cached download for the url.
+
+    Parameters
+    ----------
+    url : str
+        The url the file was downloaded from.
+
+    Returns
+    -------
+    str
+        The path of the cached download.
+    """
+    return os.path.join(_http_cache_dir(), sha256(url.encode('UTF-8')).hexdigest())
+
+def _open_http_cache(cache_path: str) -> Tuple[Dict[str, str], BinaryIO] | None:
+    """Opens a cached download, reading its stored headers. The file is opened
+    before revalidating so that the entry cannot change while in use.
+
+    Parameters
+    ----------
+    cache_path : str
+        The path of the cached download.
+
+    Returns
+    -------
+    (Dict[str, str], typing.BinaryIO) | None
+        The stored headers and the file positioned at the start of the content,
+        or `None` if the download is not cached.
+    """
+    try:
+        file: BinaryIO = open(cache_path, mode = 'rb')
+    except OSError:
+        return None # Treat missing entries as not cached
+
+    try:
+        return json.loads(file.readline()), file
+    except (OSError, ValueError):
+        file.close()
+        return None # Treat unreadable entries as not cached
+
+def _evict_http_cache() -> None:
+    """Removes the least recently used downloads until the cache is within its size limit."""
+    try:
+        with os.scandir(_http_cache_dir()) as entries:
+            files: List[Tuple[float, int, str]] = [
+                (stat.st_mtime, stat.st_size, entry.path) for entry in entries
+                    if entry.is_file() and (stat := entry.stat())
+            ]
+    except OSError:
+        return
+
+    size: int = sum(file[1] for file in files)
+    for _, file_size, path in sorted(files):
+        if size <= _HTTP_CACHE_MAX_SIZE:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue # Entry was already removed or is in use
+        size -= file_size
+
+class _CachingReader:
+    """A reader which copies the content of a response to the cache as it is read.
+
+    Parameters
+    ----------
+    raw : Any
+        The raw stream of the response.
+    file : typing.BinaryIO
+        The binary file to copy the content to.
+    """
+
+    def __init__(self, raw: Any, file: BinaryIO) -> None:
+        self.raw: Any = raw
+        self.file: BinaryIO = file
+        self.complete: bool = False
+
+    def read(self, size: int = -1) -> bytes:
+        """Reads and caches the next bytes of the response.
+
+        Parameters
+        ----------
+        size : int (default -1)
+            The maximum number of bytes to read, or all remaining bytes if negative.
+
+        Returns
+        -------
+        bytes
+            The bytes read from the response.
+        """
+        if data := self.raw.read(size):
+            self.file.write(data)
+        elif size != 0:
+            self.complete = True
+        return data
+
+    def close(self) -> None:
+        """Closes the raw stream of the response."""
+        self.raw.close()
+
+    def release_conn(self) -> None:
+        """Releases the connection of the response back to the pool."""
+        if (release_conn := getattr(self.raw, 'release_conn', None)) is not None:
+            release_conn()
+
+def _handle_and_cache_response(url: str, response: 'requests.Response',
+        handler: Callable[['requests.Response', str], bool], cache_path: str,
         stream: bool = True) -> bool:
-    """Downloads a file from the specified url via a GET request and handles the response
-    bytes as specified.
-    
+    """Handles the response, copying its content and headers to the cache while
+    it is read if the response can be revalidated and is small enough to store.
+
     Parameters
     ----------
     url : str
-        The url to download the file from.
+        The url the file was downloaded from.
+    response : requests.Response
+        The response of the url request.
     handler : (requests.Response, str) -> bool
         A function which takes in the response and filename and returns whether the file was
         successfully handled.
+    cache_path : str
+        The path of the cached download.
     stream : bool (default True)
-        If `False`, the response content will be immediately downloaded.
+        If `False`, the response content has already been downloaded.
 
     Returns
     -------
     bool
-        `True` if the file was successfully downloaded, `False` otherwise
+        `True` if the file was successfully handled, `False` otherwise
+    """
+    headers: Dict[str, str] = {header: value for header in _CACHED_HEADERS
+        if (value := response.headers.get(header)) is not None}
+
+    # Responses without validators cannot be revalidated, and responses which
+    # forbid storing or are of unknown or large size are not stored
+    length: str = response.headers.get(_CONTENT_LENGTH, '')
+    if (_ETAG not in headers and _LAST_MODIFIED not in headers) \
+            or 'no-store' in response.headers.get(_CACHE_CONTROL, '').casefold() \
+            or not length.isdigit() or int(length) > _HTTP_CACHE_MAX_ENTRY_SIZE:
+        return _handle_response(url, response, handler)
+
+    # Write to a unique file so concurrent downloads do not conflict
+    try:
+        os.makedirs(cache_dir := _http_cache_dir(), exist_ok = True)
+        part_fd, part_path = mkstemp(suffix = os.extsep + 'part', dir = cache_dir)
+    except OSError:
+        return _handle_response(url, response, handler) # Cache is not writable
+
+    try:
+        with open(part_fd, mode = 'wb') as file:
+            file.write(json.dumps(headers).encode('UTF-8') + b'\n')
+            if stream:
+                # Decode any transfer encodings before the content is copied
+                if hasattr(response.raw, 'decode_content'):
+                    response.raw.decode_content = True
+                reader: _CachingReader = _CachingReader(response.raw, file)
+                response.raw = reader
+                handled: bool = _handle_response(url, response, handler)
+                complete: bool = reader.complete
+            else:
+                file.write(response.content)
+                handled: bool = _handle_response(url, response, handler)
+                complete: bool = True
+
+        # Only store the download if the entire content was read
+        if handled and complete:
+            try:
+                os.replace(part_path, cache_path)
+            except OSError:
+                pass # Entry is in use by another download, so keep it instead
+            else:
+                _evict_http_cache()
+        return handled
+    finally:
+        try:
+            os.remove(part_path)
+        except FileNotFoundError:
+            pass # Part was moved into the cache or already evicted
+
+def _cached_response(url: str, headers: Dict[str, str],
+        file: BinaryIO) -> 'requests.Response':
+    """Creates a response which reads from a cached download.
+
+    Parameters
+    ----------
+    url : str
+        The url the file was downloaded from.
+    headers : Dict[str, str]
+        The stored headers of the cached download.
+    file : typing.BinaryIO
+        The cached download positioned at the start of the content.
+
+    Returns
+    -------
+    requests.Response
+        The response containing the cached download.
+    """
+    from requests import Response
+    from requests.structures import CaseInsensitiveDict
+
+    response: Response = Response()
+    response.status_code = HTTPStatus.OK
+    response.url = url
+    response.headers = CaseInsensitiveDict(headers)
+    response.raw = file
+    return response
+
+@lru_cache(maxsize = 128)
+def _guess_extension(content_type: str) -> str | None:
+    """Guesses and caches the file extension of a content type.
+
+    Parameters
+    ----------
+    content_type : str
+        The MIME type of the content.
+
+    Returns
+    -------
+    str | None
+        The file extension, or `None` if the type is unknown.
+    """
+    return guess_extension(content_type)
+
+def _parse_filename(disposition: str) -> str | None:
+    """Gets the filename from the content-disposition header, preferring the
+    percent-encoded filename* parameter when its charset is known.
+
+    Parameters
+    ----------
+    disposition : str
+        The value of the content-disposition header.
+
+    Returns
+    -------
+    str | None
+        The base name of the filename within the header, or `None` if not present
+        or not a valid name.
     """
+    # Skip matching headers which cannot contain a filename
+    if 'filename' not in disposition:
+        return None
+
+    filename: str | None = None
+    if (match := _FILENAME_STAR_PARAM_REGEX.search(disposition)) is not None:
+        try:
+            filename = unquote(match.group(2), encoding = match.group(1))
+        except LookupError:
+            pass # Unknown charset, fallback to the plain filename
+    if filename is None and (match := _FILENAME_PARAM_REGEX.search(disposition)) is not None:
+        filename = match.group(1) or match.group(2)
+
+    # Strip any directories so the file cannot be written outside the output directory
+    if filename is not None:
+        filename = os.path.basename(filename.replace('\\', '/'))
+    return None if filename in (None, '', os.curdir, os.pardir) else filename
+
+def _handle_response(url: str, response: 'requests.Response',
+        handler: Callable[['requests.Response', str], bool]) -> bool:
+    """Gets the filename of the downloaded file and handles the response.
+
+    Parameters
+    ----------
+    url : str
+        The url the file was downloaded from.
+    response : requests.Response
+        The response of the url request.
+    handler : (requests.Response, str) -> bool
+        A function which takes in the response and filename and returns whether the file was
+        successfully handled.
+
+    Returns
+    -------
+    bool
+        `True` if the file was successfully handled, `False` otherwise
+    """
+
+    # Get filename
+    filename: str | None = None
+
+    ## Lookup filename from content disposition if present
+    if (disposition := response.headers.get(_CONTENT_DISPOSITION)) is not None:
+        filename = _parse_filename(disposition)
 
-    # Download data within 5 minutes
-    with requests.get(url, stream = stream, allow_redirects = True,
-            timeout = 300) as response: # type: requests.Response
-        # If cannot grab file, return False
-        if not response.ok:
-            return False
+    # Set to basename of path if not present
+    if not filename:
+        filename = os.path.basename(urlparse(url).path)
 
-        # Get filename
-        filename: str | None = None
+    # Check to see if extension is present
+    name, ext = os.path.splitext(filename)
 
-        ## Lookup filename from content disposition if present
-        if _CONTENT_DISPOSITION in response.headers:
-            if 'filename*' in (disposition := response.headers[_CONTENT_DISPOSITION]):
-                filename: str = re.findall(_FILENAME_STAR_PARAM_REGEX, disposition)[0]
-            elif 'filename' in disposition:
-                matches: Tuple[str, str] = re.findall(_FILENAME_PARAM_REGEX, disposition)[0]
-                filename: str = matches[0] if matches[0] else matches[1]
+    # If no extension is present and we have access to the content type
+    if not ext and (content_type := response.headers.get(_CONTENT_TYPE)) is not None \
+            and (ext := _guess_extension(content_type.partition(';')[0].strip())) is not None:
+        filename = name + ext
 
-        # Set to basename of path if not present
-        if not filename:
-            filename = os.path.basename(urlparse(url).path)
+    # Handle the result of the downloaded file
+    return handler(response, filename)
 
-        # Check to see if extension is present
-        name, ext = os.path.splitext(filename)
+def download_file(url: str, handler: Callable[['requests.Response', str], bool],
+        stream: bool = True) -> bool:
+    """Downloads a file from the specified url via a GET request and handles the response
+    bytes as specified. Small files which can be revalidated are cached, and only downloaded
+    again if they have changed.
+    
+    Parameters
+    ----------
+    url : str
+        The url to download the file from.
+    handler : (requests.Response, str) -> bool
+        A function which takes in the response and filename and returns whether the file was
+        successfully handled.
+    stream : bool (default True)
+        If `False`, the response content will be immediately downloaded.
 
-        # If no extension is present and we have access to the content type
-        if not ext and _CONTENT_TYPE in response.headers:
-            filename = name + guess_extension(response.headers[_CONTENT_TYPE]
-                .partition(';')[0].strip())
+    Returns
+    -------
+    bool
+        `True` if the file was successfully downloaded, `False` otherwise
+    """
 
-        # Handle the result of the downloaded file
-        return handler(response, filename)
+    # Send the validators of a previous download, if present
+    cache_path: str = _http_cache_path(url)
+    cached: Tuple[Dict[str, str], BinaryIO] | None = _open_http_cache(cache_path)
+    request_headers: Dict[str, str] = {}
+    if cached is not None:
+        if _ETAG in cached[0]:
+            request_headers['If-None-Match'] = cached[0][_ETAG]
+        if _LAST_MODIFIED in cached[0]:
+            request_headers['If-Modified-Since'] = cached[0][_LAST_MODIFIED]
+
+    try:
+        # Download data within 5 minutes
+        with _get_session().get(url, headers = request_headers, stream = stream,
+                allow_redirects = True, timeout = 300) as response: # type: requests.Response
+            # If changed, handle the response while caching it
+            if response.status_code != HTTPStatus.NOT_MODIFIED or cached is None:
+                # Close the stale entry so that it can be replaced
+                if cached is not None:
+                    cached[1].close()
+                    cached = None
+
+                # If cannot grab file, return False
+                if not response.ok:
+                    return False
+
+                return _handle_and_cache_response(url, response, handler, cache_path,
+                    stream = stream)
+
+        # Mark the download as recently used and handle it
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass # Entry was replaced or evicted, but the opened file is still readable
+        with _cached_response(url, *cached) as response: # type: requests.Response
+            return _handle_response(url, response, handler)
+    finally:
+        if cached is not None:
+            cached[1].close()
 
 def download_and_write(url: str, unzip_file: bool = True, out_dir: str = os.curdir,
         stream: bool = True) -> bool:
@@ -216,7 +708,7 @@ def download_and_write(url: str, unzip_file: bool = True, out_dir: str = os.curd
         `True` if the file was successfully downloaded, `False` otherwise
     """
 
-    def __write(__response: requests.Response, __filename: str, __dir: str) -> bool:
+    def __write(__response: 'requests.Response', __filename: str, __dir: str) -> bool:
         """Writes the file or unzips it to the specified directory.
 
         Parameters
@@ -236,8 +728,10 @@ def download_and_write(url: str, unzip_file: bool = True, out_dir: str = os.curd
 
         # Unzip file if available and set
         if unzip_file and __filename.endswith('.zip'):
-            with BytesIO(__response.content) as zip_bytes: # type: BytesIO
-                unzip(zip_bytes, out_dir = __dir)
+            with SpooledTemporaryFile(max_size = _SPOOL_MAX_SIZE) as zip_file:
+                _copy_response(__response, zip_file, stream = stream)
+                zip_file.seek(0)
+                unzip(zip_file, out_dir = __dir)
         # Otherwise do normal extraction
         else:
             # Create directory name if not already present
@@ -245,8 +739,7 @@ def download_and_write(url: str, unzip_file: bool = True, out_dir: str = os.curd
             os.makedirs(os.path.dirname(name), exist_ok = True)
 
             with open(name, 'wb') as file:
-                for data in __response.iter_content(1024): # type: ReadableBuffer
-                    file.write(data)
+                _copy_response(__response, file, stream = stream)
         return True
 
     return download_file(url,
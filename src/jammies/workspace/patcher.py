@@ -7,7 +7,7 @@ between two blocks of text.
 
 import re
 from difflib import unified_diff
-from typing import Iterator, List
+from typing import Iterator, List, Callable
 from datetime import datetime
 
 _NO_EOL: str = '\\ No newline at end of file'
@@ -41,6 +41,9 @@ def create_patch(from_text: str, to_text: str, filename: str = '',
     str
         The generated patch.
     """
+    # Skip diffing when there are no changes
+    if from_text == to_text:
+        return ''
 
     diffs: Iterator[str] = unified_diff(
         from_text.splitlines(keepends = True),
@@ -73,7 +76,8 @@ def apply_patch(text: str, patch: str, revert: bool = False) -> str:
     # Setup basic references and result vars
     text: List[str] = text.splitlines(keepends = True)
     patch: List[str] = patch.splitlines(keepends = True)
-    patched_text: str = ''
+    patch_len: int = len(patch)
+    patched_text: List[str] = []
 
     pidx: int = 0 # Index line into patch
     tidx: int = 0 # Index line into text
@@ -83,19 +87,23 @@ def apply_patch(text: str, patch: str, revert: bool = False) -> str:
     ## sign is whether to consider the addition or removal as the final transformer
     midx, sign = (1, '+') if not revert else (3, '-') # midx, sign: int, str
 
+    # Bind the hunk header matcher once for all hunks
+    match_header: Callable[[str], re.Match[str] | None] = _HUNK_HEADER.match
+
     # Skip header lines
-    while pidx < len(patch) and patch[pidx].startswith(('---', '+++')):
+    while pidx < patch_len and patch[pidx].startswith(('---', '+++')):
         pidx += 1
 
     # Apply patches as long as there are still patch lines left
-    while pidx < len(patch):
+    while pidx < patch_len:
         # Get header
-        header: re.Match[str] | None = _HUNK_HEADER.match(patch[pidx])
+        header: re.Match[str] | None = match_header(patch[pidx])
         if not header: # If there is no hunk header, throw an exception
             raise PatchError(f'No header found for new hunk on line {pidx}')
 
         # Get the first line index in the text file to apply/revert the patch for
-        shidx = int(header.group(midx)) - 1 + (header.group(midx + 1) == '0')
+        group: Callable[[int], str | None] = header.group
+        shidx = int(group(midx)) - 1 + (group(midx + 1) == '0')
         # Make sure start hunk index is not after current text index
         ## and that the start hunk index is not after the number of lines in the text file
         if tidx > shidx:
@@ -104,18 +112,18 @@ def apply_patch(text: str, patch: str, revert: bool = False) -> str:
             raise PatchError(f'Hunk start index {shidx} is after the end of the text')
 
         # Add any lines before the hunk start index to the result
-        patched_text += ''.join(text[tidx:shidx])
+        patched_text.extend(text[tidx:shidx])
 
         # Set the new text start index and move to next patch line
         tidx = shidx
         pidx += 1
 
         # Loop through patch until eol or next hunk
-        while pidx < len(patch) and patch[pidx][0] != '@':
+        while pidx < patch_len and patch[pidx][0] != '@':
             # If the next patch line is not the end of the text
             ## and the first character isn't a backslash
             ### (indicates either \t, \n, or the _NO_EOL text)
-            if pidx + 1 < len(patch) and patch[pidx + 1][0] == '\\':
+            if pidx + 1 < patch_len and patch[pidx + 1][0] == '\\':
                 # Get the line without the last character
                 ## and increase the patch index by 2
                 line: str = patch[pidx][:-1]
@@ -125,14 +133,14 @@ def apply_patch(text: str, patch: str, revert: bool = False) -> str:
                 line: str = patch[pidx]
                 pidx += 1
             # If the line isn't empty
-            if len(line) > 0:
+            if line:
                 # If the first character of the line is the sign
                 ## or a space
-                if line[0] == sign or line[0] == ' ':
+                if (first := line[0]) == sign or first == ' ':
                     # Apply the patched text without the first character
-                    patched_text += line[1:]
+                    patched_text.append(line[1:])
                 # Skip the line if it is not the current sign being checked for
-                tidx += (line[0] != sign)
+                tidx += (first != sign)
     # Apply the rest of the text after all patches were made
-    patched_text += ''.join(text[tidx:])
-    return patched_text
+    patched_text.extend(text[tidx:])
+    return ''.join(patched_text)
@@ -4,17 +4,24 @@ and generating patches for a project.
 
 import os
 from pathlib import PurePath
+from typing import Any, Callable, List, Set, TYPE_CHECKING
 import shutil
 import json
+import filecmp
+from threading import Thread
 from datetime import datetime
+from itertools import repeat
 from urllib.parse import urlparse
-from requests import Response
 from jammies.log import Logger
-from jammies.utils import download_file
+from jammies.module import has_module, load_module
+from jammies.utils import download_file, clone_file, iter_files, SKIPPED_DIRS
 from jammies.defn.metadata import ProjectMetadata, METADATA_CODEC, build_metadata
 from jammies.workspace.patcher import apply_patch, create_patch
 from jammies.config import JammiesConfig
 
+if TYPE_CHECKING:
+    from requests import Response
+
 PROJECT_METADATA_NAME: str = 'project_metadata.json'
 """The file name of the project metadata."""
 
@@ -24,6 +31,47 @@ _PATCH_EXTENSION: str = 'patch'
 _TMP_DIR: str = '.tmp'
 """The directory for temporary files or directories."""
 
+_JSON_LOADS: Callable[[bytes | str], Any] = load_module('orjson').loads \
+    if has_module('orjson') else json.loads
+"""The method used to parse JSON, using `orjson` when installed."""
+
+_PENDING_REMOVALS: List[Thread] = []
+"""The threads removing directories in the background."""
+
+_PARALLEL_PATCH_THRESHOLD: int = 32
+"""The minimum number of patches to apply or generate before using multiple processes."""
+
+def _remove_dir(dirpath: str) -> None:
+    """Removes a directory and its contents. The directory is renamed first so that
+    the path can be reused immediately while the contents are deleted in the background.
+
+    Parameters
+    ----------
+    dirpath : str
+        The path of the directory to remove.
+    """
+    dirpath: str = os.path.abspath(dirpath)
+    removed_path: str = os.path.join(os.path.dirname(dirpath),
+        f'.{os.path.basename(dirpath)}.{os.urandom(4).hex()}.del')
+    try:
+        os.rename(dirpath, removed_path)
+    except OSError:
+        # Directory cannot be renamed, so remove in place
+        shutil.rmtree(dirpath)
+        return
+
+    # Removal finishes before the interpreter exits as the thread is not a daemon
+    thread: Thread = Thread(target = shutil.rmtree, args = (removed_path,),
+        kwargs = {'ignore_errors': True})
+    thread.start()
+    _PENDING_REMOVALS.append(thread)
+
+def _wait_for_removals() -> None:
+    """Waits for all directories being removed in the background to be deleted.
+    """
+    while _PENDING_REMOVALS:
+        _PENDING_REMOVALS.pop().join()
+
 def read_metadata(dirpath: str = os.curdir, import_loc: str | None = None) -> ProjectMetadata:
     """Creates or reads project metadata for the current / to-be workspace.
 
@@ -46,7 +94,7 @@ def read_metadata(dirpath: str = os.curdir, import_loc: str | None = None) -> Pr
         if urlparse(import_loc).scheme in ('http', 'https'):
             json_bytes: bytes = None
 
-            def get_metadata_str(response: Response) -> bool:
+            def get_metadata_str(response: 'Response') -> bool:
                 """Reads the bytes of a response object into a higher scope variable.
                 
                 Parameters
@@ -70,14 +118,14 @@ def read_metadata(dirpath: str = os.curdir, import_loc: str | None = None) -> Pr
                 stream = False
             ):
                 return write_metadata_to_file(dirpath,
-                    METADATA_CODEC.decode(json.loads(json_bytes)))
+                    METADATA_CODEC.decode(_JSON_LOADS(json_bytes)))
 
         # Otherwise, assume import is a path and check if it exists
         elif os.path.exists(import_loc):
             return write_metadata_to_file(dirpath, read_metadata_from_file(import_loc))
 
     # If none, check if project metadata exists in directory
-    if os.path.exists((path := os.sep.join([dirpath, PROJECT_METADATA_NAME]))):
+    if os.path.exists((path := os.path.join(dirpath, PROJECT_METADATA_NAME))):
         return read_metadata_from_file(path)
 
     # Otherwise, open the builder
@@ -97,8 +145,9 @@ def read_metadata_from_file(path: str) -> ProjectMetadata:
         The metadata for the current / to-be workspace.
     """
 
-    with open(path, mode = 'r', encoding = 'UTF-8') as file:
-        return METADATA_CODEC.decode(json.load(file))
+    # Read the entire file at once before parsing
+    with open(path, mode = 'rb') as file:
+        return METADATA_CODEC.decode(_JSON_LOADS(file.read()))
 
 def write_metadata_to_file(dirpath: str, metadata: ProjectMetadata) -> ProjectMetadata:
     """Writes a project metadata, named `project_metadata.json`, to a file location.
@@ -116,7 +165,7 @@ def write_metadata_to_file(dirpath: str, metadata: ProjectMetadata) -> ProjectMe
         The metadata for the current workspace.
     """
 
-    with open(os.sep.join([dirpath, PROJECT_METADATA_NAME]),
+    with open(os.path.join(dirpath, PROJECT_METADATA_NAME),
             mode = 'w', encoding = 'UTF-8') as file:
         print(json.dumps(METADATA_CODEC.encode(metadata), indent = 4), file = file)
 
@@ -147,7 +196,7 @@ def setup_clean(metadata: ProjectMetadata, logger: Logger, config: JammiesConfig
 
     # If the cache should be invalidated, delete the clean directory
     if invalidate_cache and os.path.exists(clean_dir) and os.path.isdir(clean_dir):
-        shutil.rmtree(clean_dir)
+        _remove_dir(clean_dir)
 
     # If the cache exists, then skip generation
     ## Otherwise generate the metadata information
@@ -171,21 +220,53 @@ def apply_patches(working_dir: str = 'src', patch_dir: str = 'patches') -> bool:
     """
 
     # Assume both directories are present
-    for subdir, _, files in os.walk(patch_dir):
-        for file in files:
-            patch_path: str = os.path.join(subdir, file)
-            # Get the relative path of the file for the working directory
-            rel_path: str = patch_path[(len(patch_dir) + 1):-(len(_PATCH_EXTENSION) + 1)]
-
-            # Apply patch to working directory
-            with open(patch_path, mode = 'r', encoding = 'UTF-8') as patch_file, \
-                    open(os.path.join(working_dir, rel_path),
-                        mode = 'r+', encoding = 'UTF-8') as work_file:
-                work_patch: str = apply_patch(work_file.read(), patch_file.read())
-                # Update work file with new information
-                work_file.seek(0)
-                work_file.write(work_patch)
-                work_file.truncate()
+    patch_paths: List[str] = []
+    work_paths: List[str] = []
+    patch_suffix: str = os.extsep + _PATCH_EXTENSION
+    for patch_path, rel_patch_path in iter_files(patch_dir, skip_dirs = SKIPPED_DIRS):
+        # Get the relative path of the file for the working directory
+        rel_path: str = rel_patch_path.removesuffix(patch_suffix)
+        patch_paths.append(patch_path)
+        work_paths.append(os.path.join(working_dir, rel_path))
+
+    # Apply patches sequentially if too few to benefit from multiple processes
+    if len(patch_paths) < _PARALLEL_PATCH_THRESHOLD:
+        return all([_apply_patch_file(patch_path, work_path)
+            for patch_path, work_path in zip(patch_paths, work_paths)])
+
+    # Worker processes are only needed for large patch sets
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Forking while directories are being removed is unsafe
+    _wait_for_removals()
+    with ProcessPoolExecutor() as executor:
+        return all(executor.map(_apply_patch_file, patch_paths, work_paths, chunksize = 16))
+
+def _apply_patch_file(patch_path: str, work_path: str) -> bool:
+    """Applies a patch to a file in the working directory.
+
+    Parameters
+    ----------
+    patch_path : str
+        The path of the patch file.
+    work_path : str
+        The path of the file in the working directory to patch.
+
+    Returns
+    -------
+    bool
+        Whether the operation was successfully executed.
+    """
+
+    with open(patch_path, mode = 'r', encoding = 'UTF-8') as patch_file, \
+            open(work_path, mode = 'r+', encoding = 'UTF-8') as work_file:
+        work_text: str = work_file.read()
+        work_patch: str = apply_patch(work_text, patch_file.read())
+        # Update work file with new information, if any
+        if work_patch != work_text:
+            work_file.seek(0)
+            work_file.write(work_patch)
+            work_file.truncate()
 
     return True
 
@@ -215,21 +296,41 @@ def setup_working(clean_dir: str = 'clean', working_dir: str = 'src',
 
     # Remove existing working directory if exists
     if os.path.exists(working_dir) and os.path.isdir(working_dir):
-        shutil.rmtree(working_dir)
+        _remove_dir(working_dir)
 
     # Generate working directory (shouldn't exist)
     os.makedirs(working_dir)
 
     # Copy clean directory into working directory (clean directory must exist)
     if include_hidden:
-        shutil.copytree(clean_dir, working_dir, dirs_exist_ok = True)
+        shutil.copytree(clean_dir, working_dir, dirs_exist_ok = True,
+            copy_function = clone_file)
     else:
         shutil.copytree(clean_dir, working_dir, dirs_exist_ok = True,
-            ignore = shutil.ignore_patterns('.*'))
+            ignore = shutil.ignore_patterns('.*'), copy_function = clone_file)
 
     return setup_working_raw(working_dir = working_dir, patch_dir = patch_dir,
         out_dir = out_dir)
 
+def _has_contents(dirpath: str) -> bool:
+    """Returns whether the path is a directory containing at least one entry.
+
+    Parameters
+    ----------
+    dirpath : str
+        The path of the directory.
+
+    Returns
+    -------
+    bool
+        `True` if the directory exists and is not empty, `False` otherwise.
+    """
+    if not os.path.isdir(dirpath):
+        return False
+
+    with os.scandir(dirpath) as entries:
+        return any(entries)
+
 def setup_working_raw(working_dir: str = 'src', patch_dir: str = 'patches',
         out_dir: str = 'out') -> bool:
     """Generates a working directory from the project metadata and any additional
@@ -250,9 +351,10 @@ def setup_working_raw(working_dir: str = 'src', patch_dir: str = 'patches',
         Whether the operation was successfully executed.
     """
 
-    # If an output directory exists, copy into working directory
-    if os.path.exists(out_dir) and os.path.isdir(out_dir):
-        shutil.copytree(out_dir, working_dir, dirs_exist_ok = True)
+    # If an output directory exists and is not empty, copy into working directory
+    if _has_contents(out_dir):
+        shutil.copytree(out_dir, working_dir, dirs_exist_ok = True,
+            copy_function = clone_file)
 
     # If the patches directory exists, apply patches to working directory
     return apply_patches(working_dir, patch_dir) \
@@ -282,7 +384,7 @@ def check_existing_patch(rel_patch_path: str, patch_path: str,
     """
 
     if os.path.exists(temp_patch_path :=
-            os.path.join(os.path.join(_TMP_DIR, patch_dir), rel_patch_path)):
+            os.path.join(_TMP_DIR, patch_dir, rel_patch_path)):
         # Read existing patch for comparison
         patch_text_no_head: str = ''.join(patch_text.splitlines(keepends = True)[2:])
         temp_patch_text: str | None = None
@@ -297,7 +399,8 @@ def check_existing_patch(rel_patch_path: str, patch_path: str,
     return False
 
 def generate_patch(path: str, work_path: str, clean_path: str,
-        patch_dir: str = 'patches', time: str = str(datetime.now())) -> bool:
+        patch_dir: str = 'patches', time: str = str(datetime.now()),
+        created_dirs: Set[str] | None = None) -> bool:
     """Generates a patch between two files if they are not equal.
 
     Parameters
@@ -312,6 +415,8 @@ def generate_patch(path: str, work_path: str, clean_path: str,
         The directory containing the patches for the project files.
     time : str  (default `datetime.datetime.now`)
         The time the patch was generated.
+    created_dirs : set of strs | None (default None)
+        The directories already created, shared across calls to skip creating them again.
     
     Returns
     -------
@@ -319,6 +424,16 @@ def generate_patch(path: str, work_path: str, clean_path: str,
         Whether the operation was successfully executed.
     """
 
+    # Skip files which are unchanged from the clean workspace
+    ## Copies keep the source's size and modification time, so these are compared first.
+    ## Edits and applied patches rewrite the file, while files copied from the output
+    ## directory are overwritten and so are never passed here
+    if filecmp.cmp(work_path, clean_path, shallow = True):
+        return True
+
+    rel_patch_path: str = os.extsep.join([path, _PATCH_EXTENSION])
+    patch_path: str = os.path.join(patch_dir, rel_patch_path)
+
     # Assume patches directory exists
     with open(work_path, mode = 'r', encoding = 'UTF-8') as work_file, \
             open(clean_path, mode = 'r', encoding = 'UTF-8') as clean_file:
@@ -326,11 +441,8 @@ def generate_patch(path: str, work_path: str, clean_path: str,
         if (patch_text := create_patch(clean_file.read(), work_file.read(),
                 filename = path,
                 time = time)):
-            rel_patch_path: str = os.extsep.join([path, _PATCH_EXTENSION])
-            patch_path: str = os.path.join(patch_dir, rel_patch_path)
-
             # Create directory if necessary
-            os.makedirs(os.path.dirname(patch_path), exist_ok = True)
+            _make_parent_dirs(patch_path, created_dirs)
 
             if check_existing_patch(rel_patch_path, patch_path, patch_text, patch_dir = patch_dir):
                 return True
@@ -341,7 +453,25 @@ def generate_patch(path: str, work_path: str, clean_path: str,
 
     return True
 
-def output_file(path: str, work_path: str, out_dir: str = 'out') -> bool:
+def _make_parent_dirs(path: str, created_dirs: Set[str] | None = None) -> None:
+    """Creates the parent directories of a path if they do not already exist.
+
+    Parameters
+    ----------
+    path : str
+        The path to create the parent directories of.
+    created_dirs : set of strs | None (default None)
+        The directories already created, shared across calls to skip creating them again.
+    """
+    dirpath: str = os.path.dirname(path)
+    if created_dirs is None:
+        os.makedirs(dirpath, exist_ok = True)
+    elif dirpath not in created_dirs:
+        os.makedirs(dirpath, exist_ok = True)
+        created_dirs.add(dirpath)
+
+def output_file(path: str, work_path: str, out_dir: str = 'out',
+        created_dirs: Set[str] | None = None) -> bool:
     """Copies an additional file for the workspace to the output directory.
     
     Parameters
@@ -352,6 +482,8 @@ def output_file(path: str, work_path: str, out_dir: str = 'out') -> bool:
         The path of the file in the working directory.
     out_dir : str (default 'out')
         The directory containing additional files for the workspace.
+    created_dirs : set of strs | None (default None)
+        The directories already created, shared across calls to skip creating them again.
 
     Returns
     -------
@@ -363,7 +495,7 @@ def output_file(path: str, work_path: str, out_dir: str = 'out') -> bool:
 
     out_path: str = os.path.join(out_dir, path)
     # Create directory if necessary
-    os.makedirs(os.path.dirname(out_path), exist_ok = True)
+    _make_parent_dirs(out_path, created_dirs)
     shutil.copy(work_path, out_path)
 
     return True
@@ -399,38 +531,64 @@ def output_working(metadata: ProjectMetadata, clean_dir: str = 'clean', working_
 
     # If patch directory and output exist, delete them
     if os.path.exists(out_dir) and os.path.isdir(out_dir):
-        shutil.rmtree(out_dir)
+        _remove_dir(out_dir)
     if os.path.exists(patch_dir) and os.path.isdir(patch_dir):
         shutil.move(patch_dir, _TMP_DIR)
 
     # Generate ignored and overwritten list
     ignore, overwrite = metadata.ignore_and_overwrite(working_dir) # Set[str], Set[str]
 
-    for subdir, _, files in os.walk(working_dir):
-        for file in files:
-            # Setup paths
-            work_path: str = os.path.join(subdir, file)
-            rel_path: str = work_path[(len(working_dir) + 1):]
-            clean_path: str = os.path.join(clean_dir, rel_path)
-            rel_path_posix: str = PurePath(rel_path).as_posix()
-
-            if rel_path_posix in ignore:
-                pass # Do nothing if files are ignored
-
-            # If clean file exists, generate patch and write
-            elif os.path.exists(clean_path):
-                if rel_path_posix in overwrite:
-                    # Copy file to output if overwrite
-                    output_file(rel_path, work_path, out_dir = out_dir)
-                else:
-                    # Otherwise generate the patch
-                    generate_patch(rel_path, work_path, clean_path,
-                        patch_dir = patch_dir, time = time)
-
-            # Otherwise output files to directory
+    # Gather the files in the clean directory to check against
+    clean_files: Set[str] = {rel_path for _, rel_path
+        in iter_files(clean_dir, skip_dirs = SKIPPED_DIRS)}
+
+    # Directories created for patches and outputs
+    created_dirs: Set[str] = set()
+
+    # Files to generate patches for, deferred until all other files are output
+    rel_paths: List[str] = []
+    work_paths: List[str] = []
+    clean_paths: List[str] = []
+
+    for work_path, rel_path in iter_files(working_dir, skip_dirs = SKIPPED_DIRS):
+        # Setup paths
+        rel_path_posix: str = PurePath(rel_path).as_posix()
+
+        if rel_path_posix in ignore:
+            pass # Do nothing if files are ignored
+
+        # If clean file exists, generate patch and write
+        elif rel_path in clean_files:
+            if rel_path_posix in overwrite:
+                # Copy file to output if overwrite
+                output_file(rel_path, work_path, out_dir = out_dir,
+                    created_dirs = created_dirs)
             else:
-                output_file(rel_path, work_path, out_dir = out_dir)
+                # Otherwise generate the patch
+                rel_paths.append(rel_path)
+                work_paths.append(work_path)
+                clean_paths.append(os.path.join(clean_dir, rel_path))
+
+        # Otherwise output files to directory
+        else:
+            output_file(rel_path, work_path, out_dir = out_dir,
+                created_dirs = created_dirs)
+
+    # Generate patches sequentially if too few to benefit from multiple processes
+    if len(rel_paths) < _PARALLEL_PATCH_THRESHOLD:
+        for rel_path, work_path, clean_path in zip(rel_paths, work_paths, clean_paths):
+            generate_patch(rel_path, work_path, clean_path, patch_dir = patch_dir,
+                time = time, created_dirs = created_dirs)
+    else:
+        # Worker processes are only needed for large patch sets
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Forking while directories are being removed is unsafe
+        _wait_for_removals()
+        with ProcessPoolExecutor() as executor:
+            all(executor.map(generate_patch, rel_paths, work_paths, clean_paths,
+                repeat(patch_dir), repeat(time), chunksize = 16))
 
     # Delete temp directory afterwards
-    shutil.rmtree(_TMP_DIR)
+    _remove_dir(_TMP_DIR)
     return True